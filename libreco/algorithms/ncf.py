@@ -1,7 +1,14 @@
 """Implementation of NCF."""
 from ..bases import ModelMeta, TfBase
-from ..layers import dense_nn, embedding_lookup, tf_dense
-from ..tfops import dropout_config, reg_config, tf
+from ..layers import (
+    dense_nn,
+    embedding_lookup,
+    int8_embedding_lookup,
+    int8_embedding_vars,
+    int8_quantize,
+    tf_dense,
+)
+from ..tfops import dropout_config, jit_scope, reg_config, tf
 from ..torchops import hidden_units_config
 
 
@@ -62,6 +69,18 @@ class NCF(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    mixed_precision : bool, default: False
+        Whether to train and infer in bfloat16 mixed precision, which speeds up the
+        MLP on CPUs with bfloat16 support. The loss is still computed in float32.
+    jit_compile : bool, default: False
+        Whether to compile the GMF and MLP layers with XLA, which fuses the
+        concatenations and dense layers into fewer kernels. Since XLA recompiles for
+        every new input shape, it is most useful when batch sizes are fixed.
+    quantize_embeds : bool, default: False
+        Whether to use int8 user and item embeddings in inference. The embeddings are
+        quantized with a scale for each row after training, and only the looked-up rows
+        are dequantized, which reduces the memory traffic of embedding lookups.
+        Training always uses the float embeddings.
 
     References
     ----------
@@ -92,8 +111,13 @@ class NCF(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        mixed_precision=False,
+        jit_compile=False,
+        quantize_embeds=False,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, mixed_precision
+        )
 
         self.all_args = locals()
         self.loss_type = loss_type
@@ -109,6 +133,8 @@ class NCF(TfBase, metaclass=ModelMeta):
         self.use_bn = use_bn
         self.dropout_rate = dropout_config(dropout_rate)
         self.hidden_units = hidden_units_config(hidden_units)
+        self.jit_compile = jit_compile
+        self.quantize_embeds = quantize_embeds
         self.seed = seed
 
     def build_model(self):
@@ -118,30 +144,105 @@ class NCF(TfBase, metaclass=ModelMeta):
         self.labels = tf.placeholder(tf.float32, shape=[None])
         self.is_training = tf.placeholder_with_default(False, shape=[])
 
-        user_embeds = embedding_lookup(
-            indices=self.user_indices,
-            var_name="user_embeds_var",
-            var_shape=(self.n_users + 1, self.embed_size),
-            initializer=tf.glorot_uniform_initializer(),
-            regularizer=self.reg,
-        )
-        item_embeds = embedding_lookup(
-            indices=self.item_indices,
-            var_name="item_embeds_var",
-            var_shape=(self.n_items + 1, self.embed_size),
-            initializer=tf.glorot_uniform_initializer(),
-            regularizer=self.reg,
+        with tf.variable_scope("embedding"):
+            user_embeds_var = tf.get_variable(
+                name="user_embeds_var",
+                shape=(self.n_users + 1, self.embed_size),
+                initializer=tf.glorot_uniform_initializer(),
+                regularizer=self.reg,
+            )
+            item_embeds_var = tf.get_variable(
+                name="item_embeds_var",
+                shape=(self.n_items + 1, self.embed_size),
+                initializer=tf.glorot_uniform_initializer(),
+                regularizer=self.reg,
+            )
+
+        def float_embeds():
+            return (
+                embedding_lookup(self.user_indices, embed_var=user_embeds_var),
+                embedding_lookup(self.item_indices, embed_var=item_embeds_var),
+            )
+
+        if self.quantize_embeds:
+            int8_embeds = self._build_int8_embeds(user_embeds_var, item_embeds_var)
+            # only one branch is executed, so inference never reads the float tables
+            user_embeds, item_embeds = tf.cond(
+                self.is_training, float_embeds, int8_embeds
+            )
+            cross_embeds = self._cross_embeds(*int8_embeds())
+        else:
+            user_embeds, item_embeds = float_embeds()
+            cross_embeds = self._cross_embeds(user_embeds, item_embeds)
+
+        self.output = self._compute_output(user_embeds, item_embeds, self.is_training)
+        # pairs every fed user with every fed item and shares all the layers with
+        # `output`, it is only used when recommending and never runs in training.
+        self.cross_output = self._compute_output(*cross_embeds, is_training=False)
+        self.serving_topk = self.build_topk(self.output)
+
+    def _compute_output(self, user_embeds, item_embeds, is_training):
+        with jit_scope(self.jit_compile):
+            gmf_layer = tf.multiply(user_embeds, item_embeds)
+            mlp_input = tf.concat([user_embeds, item_embeds], axis=1)
+            mlp_layer = dense_nn(
+                mlp_input,
+                self.hidden_units,
+                use_bn=self.use_bn,
+                dropout_rate=self.dropout_rate,
+                is_training=is_training,
+                reuse_layer=True,
+            )
+            concat_layer = tf.concat([gmf_layer, mlp_layer], axis=1)
+            with tf.variable_scope(tf.get_variable_scope(), reuse=tf.AUTO_REUSE):
+                logits = tf_dense(units=1, reuse=True, name="dense")(concat_layer)
+        return tf.reshape(logits, [-1])
+
+    def _cross_embeds(self, user_embeds, item_embeds):
+        # rows are ordered by user, i.e. all items of the first user come first
+        n_users, n_items = tf.shape(user_embeds)[0], tf.shape(item_embeds)[0]
+        user_embeds = tf.tile(tf.expand_dims(user_embeds, 1), [1, n_items, 1])
+        item_embeds = tf.tile(item_embeds, [n_users, 1])
+        return (
+            tf.reshape(user_embeds, [-1, self.embed_size]),
+            tf.reshape(item_embeds, [-1, self.embed_size]),
         )
 
-        gmf_layer = tf.multiply(user_embeds, item_embeds)
-        mlp_input = tf.concat([user_embeds, item_embeds], axis=1)
-        mlp_layer = dense_nn(
-            mlp_input,
-            self.hidden_units,
-            use_bn=self.use_bn,
-            dropout_rate=self.dropout_rate,
-            is_training=self.is_training,
+    def _build_int8_embeds(self, user_embeds_var, item_embeds_var):
+        user_codes, user_scales = int8_embedding_vars(
+            "user_embeds_var", (self.n_users + 1, self.embed_size)
         )
-        concat_layer = tf.concat([gmf_layer, mlp_layer], axis=1)
-        self.output = tf.reshape(tf_dense(units=1)(concat_layer), [-1])
-        self.serving_topk = self.build_topk(self.output)
+        item_codes, item_scales = int8_embedding_vars(
+            "item_embeds_var", (self.n_items + 1, self.embed_size)
+        )
+        self.quantize_op = tf.group(
+            int8_quantize(user_embeds_var, user_codes, user_scales),
+            int8_quantize(item_embeds_var, item_codes, item_scales),
+        )
+
+        def int8_embeds():
+            return (
+                int8_embedding_lookup(self.user_indices, user_codes, user_scales),
+                int8_embedding_lookup(self.item_indices, item_codes, item_scales),
+            )
+
+        return int8_embeds
+
+    def quantize_embeddings(self):
+        """Update the int8 embeddings used in inference from the float embeddings.
+
+        This is called automatically after training and loading, so users don't
+        need to call it manually.
+        """
+        if self.quantize_embeds:
+            self.sess.run(self.quantize_op)
+
+    def assign_tf_variables_oov(self):
+        super().assign_tf_variables_oov()
+        self.quantize_embeddings()
+
+    @classmethod
+    def load(cls, path, model_name, data_info, manual=True):
+        model = super().load(path, model_name, data_info, manual)
+        model.quantize_embeddings()
+        return model
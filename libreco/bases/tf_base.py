@@ -43,11 +43,21 @@ class TfBase(Base):
     tf_sess_config : dict or None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    mixed_precision : bool, default: False
+        Whether to compute the model in bfloat16 mixed precision on CPUs.
+        Numerically sensitive ops such as losses are kept in float32.
     """
 
-    def __init__(self, task, data_info, lower_upper_bound=None, tf_sess_config=None):
+    def __init__(
+        self,
+        task,
+        data_info,
+        lower_upper_bound=None,
+        tf_sess_config=None,
+        mixed_precision=False,
+    ):
         super().__init__(task, data_info, lower_upper_bound)
-        self.sess = sess_config(tf_sess_config)
+        self.sess = sess_config(tf_sess_config, mixed_precision)
         self.model_built = False
         self.trainer = None
         self.loaded = False
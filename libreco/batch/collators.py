@@ -19,6 +19,7 @@ from .enums import FeatType
 from .sequence import get_dual_seqs, get_interacted_seqs, get_sparse_interacted
 from ..graph import build_subgraphs, pairs_from_dgl_graph
 from ..sampling import (
+    consumed_pair_keys,
     neg_probs_from_frequency,
     negatives_from_out_batch,
     negatives_from_popular,
@@ -60,6 +61,7 @@ class BaseCollator:
         self.seed = model.seed
         self.temperature = temperature
         self.user_consumed_set = None
+        self.consumed_keys = None
         self.neg_probs = None
         self.np_rng = None
 
@@ -137,9 +139,11 @@ class BaseCollator:
 
     def sample_neg_items(self, batch, sampler, num_neg):
         if sampler == "unconsumed":
-            self._set_user_consumed()
+            self._set_random_seeds()
+            self._set_consumed_keys()
             items_neg = negatives_from_unconsumed(
-                self.user_consumed_set,
+                self.np_rng,
+                self.consumed_keys,
                 batch["user"],
                 batch["item"],
                 self.n_items,
@@ -171,6 +175,15 @@ class BaseCollator:
                 set(self.user_consumed[u]) for u in range(self.n_users)
             ]
 
+    def _set_consumed_keys(self):
+        if self.consumed_keys is None:
+            users = np.repeat(
+                np.arange(self.n_users),
+                [len(self.user_consumed[u]) for u in range(self.n_users)],
+            )
+            items = np.concatenate([self.user_consumed[u] for u in range(self.n_users)])
+            self.consumed_keys = consumed_pair_keys(users, items, self.n_items)
+
     def _set_neg_probs(self):
         if self.neg_probs is None:
             self.neg_probs = neg_probs_from_frequency(
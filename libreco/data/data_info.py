@@ -150,6 +150,8 @@ class DataInfo:
         self._item2id = None
         self._id2user = None
         self._id2item = None
+        self._user_index = None
+        self._item_index = None
         self._data_size = None
         self._popular_items = None
         # store old info for rebuild models
@@ -300,6 +302,20 @@ class DataInfo:
             self._item2id = dict(zip(self.item_unique_vals, range(self.n_items)))
         return self._item2id
 
+    @property
+    def user_index(self):
+        """User original id index, used to map ids to inner ids in batch."""
+        if self._user_index is None:
+            self._user_index = pd.Index(self.user_unique_vals)
+        return self._user_index
+
+    @property
+    def item_index(self):
+        """Item original id index, used to map ids to inner ids in batch."""
+        if self._item_index is None:
+            self._item_index = pd.Index(self.item_unique_vals)
+        return self._item_index
+
     @property
     def id2user(self):
         """User inner id to original id mapping."""
@@ -1,13 +1,11 @@
 """Transformed Dataset."""
 from collections import defaultdict
-from random import seed as set_random_seed
 
 import numpy as np
 import pandas as pd
 from scipy.sparse import csr_matrix
 
-from .consumed import interaction_consumed
-from ..sampling import negatives_from_unconsumed
+from ..sampling import consumed_pair_keys, negatives_from_unconsumed
 
 
 class TransformedSet:
@@ -146,11 +144,11 @@ class TransformedEvalSet:
         seed : int
             Random seed.
         """
-        set_random_seed(seed)
+        np_rng = np.random.default_rng(seed)
         self.has_sampled = True
         # use original users and items to sample
         items_neg = self._sample_neg_items(
-            self.user_indices, self.item_indices, n_items, num_neg
+            np_rng, self.user_indices, self.item_indices, n_items, num_neg
         )
         self.user_indices = np.repeat(self.user_indices, num_neg + 1)
         self.item_indices = np.repeat(self.item_indices, num_neg + 1)
@@ -161,11 +159,12 @@ class TransformedEvalSet:
         for i in range(num_neg):
             self.item_indices[(i + 1) :: (num_neg + 1)] = items_neg[i::num_neg]
 
-    def _sample_neg_items(self, users, items, n_items, num_neg):
-        user_consumed, _ = interaction_consumed(self.user_indices, self.item_indices)
-        user_consumed_set = {u: set(uis) for u, uis in user_consumed.items()}
+    def _sample_neg_items(self, np_rng, users, items, n_items, num_neg):
+        consumed_keys = consumed_pair_keys(
+            self.user_indices, self.item_indices, n_items
+        )
         return negatives_from_unconsumed(
-            user_consumed_set, users, items, n_items, num_neg
+            np_rng, consumed_keys, users, items, n_items, num_neg
         )
 
     def __len__(self):
@@ -7,7 +7,14 @@ from .attention import (
 )
 from .convolutional import conv_nn, max_pool
 from .dense import dense_nn, shared_dense, tf_dense
-from .embedding import embedding_lookup, seq_embeds_pooling, sparse_embeds_pooling
+from .embedding import (
+    embedding_lookup,
+    int8_embedding_lookup,
+    int8_embedding_vars,
+    int8_quantize,
+    seq_embeds_pooling,
+    sparse_embeds_pooling,
+)
 from .normalization import layer_normalization, normalize_embeds, rms_norm
 from .recurrent import tf_rnn
 
@@ -18,6 +25,9 @@ __all__ = [
     "dense_nn",
     "din_attention",
     "embedding_lookup",
+    "int8_embedding_lookup",
+    "int8_embedding_vars",
+    "int8_quantize",
     "layer_normalization",
     "max_pool",
     "multi_head_attention",
@@ -23,6 +23,42 @@ def embedding_lookup(
         return tf.nn.embedding_lookup(embed_var, indices)
 
 
+def int8_embedding_vars(var_name, var_shape, scope_name="embedding"):
+    # kept out of global variables, so they are never saved or rebuilt,
+    # and are always derived from the float embeddings by `int8_quantize`
+    collections = [tf.GraphKeys.LOCAL_VARIABLES]
+    with tf.variable_scope(scope_name):
+        codes_var = tf.get_variable(
+            name=f"{var_name}_int8",
+            shape=var_shape,
+            dtype=tf.int8,
+            initializer=tf.zeros_initializer(),
+            trainable=False,
+            collections=collections,
+        )
+        scales_var = tf.get_variable(
+            name=f"{var_name}_scale",
+            shape=(var_shape[0], 1),
+            initializer=tf.zeros_initializer(),
+            trainable=False,
+            collections=collections,
+        )
+    return codes_var, scales_var
+
+
+def int8_quantize(embed_var, codes_var, scales_var):
+    # symmetric int8 quantization with a scale for each row
+    scales = tf.reduce_max(tf.abs(embed_var), axis=1, keepdims=True) / 127.0
+    codes = tf.cast(tf.round(tf.div_no_nan(embed_var, scales)), tf.int8)
+    return tf.group(codes_var.assign(codes), scales_var.assign(scales))
+
+
+def int8_embedding_lookup(indices, codes_var, scales_var):
+    # only the looked-up rows are dequantized
+    codes = tf.cast(tf.nn.embedding_lookup(codes_var, indices), tf.float32)
+    return codes * tf.nn.embedding_lookup(scales_var, indices)
+
+
 def sparse_embeds_pooling(
     sparse_indices,
     var_name,
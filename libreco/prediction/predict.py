@@ -16,11 +16,13 @@ from ..utils.validate import check_unknown
 
 
 def normalize_prediction(preds, model, cold_start, unknown_num, unknown_index):
+    # predictions are freshly computed float arrays, so transform them in place
+    out = preds if isinstance(preds, np.ndarray) and preds.dtype.kind == "f" else None
     if model.task == "rating":
-        preds = np.clip(preds, model.lower_bound, model.upper_bound)
+        preds = np.clip(preds, model.lower_bound, model.upper_bound, out=out)
     elif model.task == "ranking":
         # preds = 1 / (1 + np.exp(-z))
-        preds = expit(preds)
+        preds = expit(preds, out=out)
 
     if unknown_num > 0 and cold_start == "popular":
         if isinstance(preds, np.ndarray):
@@ -7,11 +7,18 @@ def convert_id(model, user, item, inner_id=False):
     user = [user] if np.isscalar(user) else user
     item = [item] if np.isscalar(item) else item
     if not inner_id:
-        user = [model.data_info.user2id.get(u, model.n_users) for u in user]
-        item = [model.data_info.item2id.get(i, model.n_items) for i in item]
+        user = _map_ids(model.data_info.user_index, user, model.n_users)
+        item = _map_ids(model.data_info.item_index, item, model.n_items)
     return np.array(user), np.array(item)
 
 
+# hash lookup over the whole array, unknown ids get -1 and are mapped to oov
+def _map_ids(id_index, ids, oov_id):
+    indices = id_index.get_indexer(ids)
+    indices[indices == -1] = oov_id
+    return indices
+
+
 def get_original_feats(data_info, user, item, sparse, dense):
     """Get original features from data_info to predict using feat models."""
     user = [user] if np.isscalar(user) else user
@@ -27,16 +27,19 @@ def rank_recommendations(
     else:
         batch_size = len(model_preds)
         all_preds = model_preds
-    all_ids = np.tile(np.arange(n_items), (batch_size, 1))
+    all_ids = np.arange(n_items)
 
     batch_ids, batch_preds = [], []
     for i in range(batch_size):
         user = user_ids[i]
-        ids = all_ids[i]
+        ids = all_ids
         preds = all_preds[i]
         consumed = user_consumed[user] if user in user_consumed else []
         if filter_consumed and consumed and n_rec + len(consumed) <= n_items:
-            ids, preds = filter_items(ids, preds, consumed)
+            if random_rec:
+                ids, preds = filter_items(ids, preds, consumed)
+            else:
+                preds = mask_items(preds, consumed)
         if random_rec:
             ids, preds = random_select(ids, preds, n_rec)
         else:
@@ -61,6 +64,14 @@ def filter_items(ids, preds, items):
     return ids[mask], preds[mask]
 
 
+# item ids are positions in `preds`, so consumed items can be excluded from
+# `argpartition` by overwriting their scores in place of compacting the arrays
+def mask_items(preds, items):
+    preds = preds.copy()
+    preds[items] = -np.inf
+    return preds
+
+
 # add `**0.75` to lower probability of high score items
 def get_reco_probs(preds):
     p = np.power(softmax(preds), 0.75) + 1e-8  # avoid zero probs
@@ -88,11 +88,14 @@ def recommend_tf_feat(
     random_rec,
     inner_id=False,
 ):
-    feed_dict = process_tf_feat(model, user_ids, user_feats, seq, inner_id)
-    if model.model_name == "SIM":
-        preds = model.sess.run(model.inference_output, feed_dict)
+    if model.model_name == "NCF":
+        preds = score_all_items_ncf(model, user_ids)
     else:
-        preds = model.sess.run(model.output, feed_dict)
+        feed_dict = process_tf_feat(model, user_ids, user_feats, seq, inner_id)
+        if model.model_name == "SIM":
+            preds = model.sess.run(model.inference_output, feed_dict)
+        else:
+            preds = model.sess.run(model.output, feed_dict)
     return rank_recommendations(
         model.task,
         user_ids,
@@ -103,3 +106,16 @@ def recommend_tf_feat(
         filter_consumed,
         random_rec,
     )
+
+
+def score_all_items_ncf(model, user_ids):
+    """Score all the items for each user in a single run.
+
+    Each user and item is fed only once, and NCF pairs their embeddings
+    in the graph, so the user index doesn't need to be repeated `n_items` times.
+    """
+    feed_dict = {
+        model.user_indices: user_ids,
+        model.item_indices: np.arange(model.n_items),
+    }
+    return model.sess.run(model.cross_output, feed_dict)
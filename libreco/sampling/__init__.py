@@ -1,4 +1,5 @@
 from .negatives import (
+    consumed_pair_keys,
     neg_probs_from_frequency,
     negatives_from_out_batch,
     negatives_from_popular,
@@ -15,6 +16,7 @@ from .random_walks import (
 __all__ = [
     "bipartite_neighbors",
     "bipartite_neighbors_with_weights",
+    "consumed_pair_keys",
     "negatives_from_out_batch",
     "negatives_from_popular",
     "negatives_from_random",
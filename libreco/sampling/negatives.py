@@ -1,5 +1,4 @@
 import math
-import random
 
 import numpy as np
 
@@ -52,34 +51,47 @@ def negatives_from_out_batch(np_rng, n_items, items_pos, items, num_neg):
     return np_rng.choice(candidate_items, size=sample_num, replace=replace)
 
 
+def consumed_pair_keys(users, items, n_items):
+    """Encode consumed (user, item) pairs as sorted unique integer keys."""
+    return np.unique(np.asarray(users, dtype=np.int64) * n_items + items)
+
+
+def _is_consumed(consumed_keys, users, negatives, n_items):
+    if len(consumed_keys) == 0:
+        return np.zeros(len(negatives), dtype=bool)
+    keys = users * n_items + negatives
+    pos = np.searchsorted(consumed_keys, keys)
+    pos[pos == len(consumed_keys)] = 0
+    return consumed_keys[pos] == keys
+
+
+def _is_repeated(negatives, num_neg):
+    # a negative is invalid if it already appears earlier for the same sample
+    negatives = negatives.reshape(-1, num_neg)
+    repeated = np.zeros_like(negatives, dtype=bool)
+    for j in range(1, num_neg):
+        repeated[:, j] = np.any(negatives[:, :j] == negatives[:, j : j + 1], axis=1)
+    return repeated.ravel()
+
+
 def negatives_from_unconsumed(
-    user_consumed_set, users, items, n_items, num_neg, tolerance=10
+    np_rng, consumed_keys, users, items, n_items, num_neg, tolerance=10
 ):
-    _floor = math.floor
-    _random = random.random
-
-    def sample_one():
-        return _floor(n_items * _random())
-
-    negatives = []
-    for u, i in zip(users, items):
-        u_negs = []
-        for _ in range(num_neg):
-            success = False
-            n = sample_one()
-            for _ in range(tolerance):
-                if n != i and n not in u_negs and n not in user_consumed_set[u]:
-                    success = True
-                    break
-                n = sample_one()
-            if not success:
-                for _ in range(tolerance):
-                    if n != i and n not in u_negs:
-                        break
-                    n = sample_one()
-            u_negs.append(n)
-        negatives.extend(u_negs)
-    return np.array(negatives)
+    users = np.repeat(np.asarray(users, dtype=np.int64), num_neg)
+    items = np.repeat(items, num_neg)
+    negatives = np_rng.integers(0, n_items, size=len(items))
+    # first avoid all consumed items, then fall back to only avoiding
+    # the positive item and repeated negatives if it can't be satisfied
+    for avoid_consumed in (True, False):
+        for _ in range(tolerance):
+            invalid = (negatives == items) | _is_repeated(negatives, num_neg)
+            if avoid_consumed:
+                invalid |= _is_consumed(consumed_keys, users, negatives, n_items)
+            invalid_num = np.count_nonzero(invalid)
+            if invalid_num == 0:
+                break
+            negatives[invalid] = np_rng.integers(0, n_items, size=invalid_num)
+    return negatives
 
 
 def neg_probs_from_frequency(item_consumed, n_items, temperature):
@@ -1,6 +1,9 @@
 from .configs import (
     attention_config,
+    bf16_rewrite_option,
+    build_sess_config,
     dropout_config,
+    jit_scope,
     lr_decay_config,
     reg_config,
     sess_config,
@@ -12,8 +15,11 @@ from .version import TF_VERSION, get_tf_version, tf
 
 __all__ = [
     "attention_config",
+    "bf16_rewrite_option",
+    "build_sess_config",
     "dropout_config",
     "get_variable_from_graph",
+    "jit_scope",
     "lr_decay_config",
     "reg_config",
     "sess_config",
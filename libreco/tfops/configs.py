@@ -1,4 +1,8 @@
 import multiprocessing
+from contextlib import contextmanager
+from functools import lru_cache
+
+from tensorflow.core.protobuf.rewriter_config_pb2 import RewriterConfig
 
 from .version import tf
 
@@ -21,11 +25,17 @@ def reg_config(reg):
     if not reg:
         return None
     elif isinstance(reg, float) and reg > 0.0:
-        return tf.keras.regularizers.l2(reg)
+        return _l2_regularizer(reg)
     else:
         raise ValueError("reg must be float and positive...")
 
 
+# regularizers are stateless, so models built with the same `reg` can share one
+@lru_cache(maxsize=128)
+def _l2_regularizer(reg):
+    return tf.keras.regularizers.l2(reg)
+
+
 def dropout_config(dropout_rate):
     if not dropout_rate:
         return 0.0
@@ -45,7 +55,11 @@ def lr_decay_config(initial_lr, default_decay_steps, **kwargs):
     return learning_rate, global_steps
 
 
-def sess_config(tf_sess_config=None):
+def sess_config(tf_sess_config=None, mixed_precision=False):
+    return tf.Session(config=build_sess_config(tf_sess_config, mixed_precision))
+
+
+def build_sess_config(tf_sess_config=None, mixed_precision=False):
     if not tf_sess_config:
         # Session config based on:
         # https://software.intel.com/content/www/us/en/develop/articles/tips-to-improve-performance-for-popular-deep-learning-frameworks-on-multi-core-cpus.html
@@ -59,4 +73,39 @@ def sess_config(tf_sess_config=None):
         # os.environ["OMP_NUM_THREADS"] = f"{self.cpu_num}"
 
     config = tf.ConfigProto(**tf_sess_config)
-    return tf.Session(config=config)
+    if mixed_precision:
+        option = bf16_rewrite_option()
+        if option is None:
+            raise ValueError(
+                "bfloat16 mixed precision is not supported in "
+                f"TensorFlow {tf.__version__}"
+            )
+        setattr(config.graph_options.rewrite_options, option, RewriterConfig.ON)
+    return config
+
+
+def bf16_rewrite_option():
+    """Name of the grappler option for bfloat16 mixed precision, or None if unavailable.
+
+    Grappler rewrites eligible ops into bfloat16 with oneDNN and keeps losses in float32.
+    The option was named `auto_mixed_precision_mkl` before TensorFlow 2.9,
+    and doesn't exist in TensorFlow 1.x.
+    """
+    fields = RewriterConfig.DESCRIPTOR.fields_by_name
+    for option in ("auto_mixed_precision_onednn_bfloat16", "auto_mixed_precision_mkl"):
+        if option in fields:
+            return option
+    return None
+
+
+@contextmanager
+def jit_scope(jit_compile):
+    """Mark the ops created in this scope for XLA compilation if `jit_compile` is True.
+
+    XLA compilation is only a hint and may be ignored on devices without XLA support.
+    """
+    if jit_compile:
+        with tf.xla.experimental.jit_scope():
+            yield
+    else:
+        yield
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import torch
 import torch.nn.functional as F
 
@@ -7,67 +9,80 @@ def binary_cross_entropy_loss(logits, labels):
 
 
 # focal loss for binary cross entropy based on [Lin et al., 2018](https://arxiv.org/pdf/1708.02002.pdf)
+# scripted so that the elementwise ops can be fused into a single kernel
 def focal_loss(logits, labels, alpha=0.25, gamma=2.0, mean=True):
-    weighting_factor = (labels * alpha) + ((1 - labels) * (1 - alpha))
+    return _scripted_focal_loss()(logits, labels, float(alpha), float(gamma), mean)
+
+
+# compile on first use rather than at import time of `libreco`
+@lru_cache(maxsize=None)
+def _scripted_focal_loss():
+    return torch.jit.script(_focal_loss)
+
+
+def _focal_loss(
+    logits: torch.Tensor,
+    labels: torch.Tensor,
+    alpha: float = 0.25,
+    gamma: float = 2.0,
+    mean: bool = True,
+) -> torch.Tensor:
     probs = torch.sigmoid(logits)
-    p_t = (labels * probs) + ((1 - labels) * (1 - probs))
-    modulating_factor = torch.pow(1.0 - p_t, gamma)
-    bce = F.binary_cross_entropy_with_logits(logits, labels, reduction="none")
-    focal = weighting_factor * modulating_factor * bce
+    p_t = labels * probs + (1 - labels) * (1 - probs)
+    weighting_factor = labels * alpha + (1 - labels) * (1 - alpha)
+    # -bce = y * log(sigmoid(x)) + (1 - y) * log(sigmoid(-x))
+    log_likelihood = labels * F.logsigmoid(logits) + (1 - labels) * F.logsigmoid(
+        -logits
+    )
+    modulating_factor = 1.0 - p_t
+    # squaring directly is cheaper than the general `pow` for the default gamma
+    if gamma == 2.0:
+        modulating_factor = modulating_factor * modulating_factor
+    else:
+        modulating_factor = torch.pow(modulating_factor, gamma)
+    focal = -weighting_factor * modulating_factor * log_likelihood
     if mean:
         focal = torch.mean(focal)
     return focal
 
 
+# -log(sigmoid(pos - neg)) = softplus(neg - pos)
 def bpr_loss(pos_scores, neg_scores):
-    log_sigmoid = F.logsigmoid(pos_scores - neg_scores)
-    return torch.negative(torch.mean(log_sigmoid))
+    return torch.mean(F.softplus(neg_scores - pos_scores))
 
 
+# equivalent to `F.margin_ranking_loss` with all targets being 1
 def max_margin_loss(pos_scores, neg_scores, margin):
-    return F.margin_ranking_loss(
-        pos_scores, neg_scores, torch.ones_like(pos_scores), margin=margin
-    )
+    return torch.mean(F.relu(margin - pos_scores + neg_scores))
 
 
 def pairwise_bce_loss(pos_scores, neg_scores, mean=True):
-    pos_bce = F.binary_cross_entropy_with_logits(
-        pos_scores, torch.ones_like(pos_scores), reduction="none"
-    )
-    neg_bce = F.binary_cross_entropy_with_logits(
-        neg_scores, torch.zeros_like(neg_scores), reduction="none"
-    )
-    pos_bce = _check_dim(pos_bce)
-    neg_bce = _check_dim(neg_bce)
-    loss = torch.cat([pos_bce, neg_bce])
-    if mean:
-        return torch.mean(loss)
-    else:
-        return torch.sum(loss)
+    # bce with constant targets:
+    # -log(sigmoid(x)) = softplus(-x), -log(1 - sigmoid(x)) = softplus(x)
+    pos_bce = F.softplus(-pos_scores)
+    neg_bce = F.softplus(neg_scores)
+    return _combine_losses(pos_bce, neg_bce, mean)
 
 
 def pairwise_focal_loss(pos_scores, neg_scores, mean=True):
     pos_focal = focal_loss(pos_scores, torch.ones_like(pos_scores), mean=False)
     neg_focal = focal_loss(neg_scores, torch.zeros_like(neg_scores), mean=False)
-    pos_focal = _check_dim(pos_focal)
-    neg_focal = _check_dim(neg_focal)
-    loss = torch.cat([pos_focal, neg_focal])
-    if mean:
-        return torch.mean(loss)
-    else:
-        return torch.sum(loss)
+    return _combine_losses(pos_focal, neg_focal, mean)
 
 
-def _check_dim(tensor):  # pragma: no cover
-    if tensor.dim() == 0:
-        tensor = tensor.unsqueeze(0)
-    return tensor
+def _combine_losses(pos_loss, neg_loss, mean):
+    """Reduce positive and negative losses together without concatenating them."""
+    loss = torch.sum(pos_loss) + torch.sum(neg_loss)
+    if mean:
+        return loss / (pos_loss.numel() + neg_loss.numel())
+    else:
+        return loss
 
 
 def compute_pair_scores(targets, items_pos, items_neg, repeat_positives=True):
     if len(targets) == len(items_pos) == len(items_neg):
-        pos_scores = (targets * items_pos).sum(1)
-        neg_scores = (targets * items_neg).sum(1)
+        pos_scores = torch.einsum("ij,ij->i", targets, items_pos)
+        neg_scores = torch.einsum("ij,ij->i", targets, items_neg)
         return pos_scores, neg_scores
 
     if len(targets) != len(items_pos):
@@ -84,7 +99,7 @@ def compute_pair_scores(targets, items_pos, items_neg, repeat_positives=True):
     factor = int(neg_len / pos_len)
     pos_scores = torch.einsum("ij,ij->i", targets, items_pos)
     if repeat_positives:
-        pos_scores = pos_scores.repeat_interleave(factor)
+        pos_scores = pos_scores.unsqueeze(1).expand(-1, factor).reshape(-1)
     items_neg = items_neg.view(pos_len, factor, -1)
-    neg_scores = torch.einsum("i...k,ijk->ij", targets, items_neg).ravel()
+    neg_scores = torch.einsum("ik,ijk->ij", targets, items_neg).reshape(-1)
     return pos_scores, neg_scores
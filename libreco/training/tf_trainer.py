@@ -88,6 +88,8 @@ class TensorFlowTrainer(BaseTrainer):
                 # get embedding for evaluation
                 if EmbeddingModels.contains(self.model.model_name):
                     self.model.set_embeddings()
+                if hasattr(self.model, "quantize_embeddings"):
+                    self.model.quantize_embeddings()
                 print_metrics(
                     model=self.model,
                     neg_sampling=neg_sampling,
@@ -4,13 +4,13 @@ from ..utils.misc import colorize
 
 
 def check_unknown(model, user, item):
-    unknown_user_indices = list(np.where(user == model.n_users)[0])
-    unknown_item_indices = list(np.where(item == model.n_items)[0])
-    unknown_index = list(set(unknown_user_indices) | set(unknown_item_indices))
+    unknown_mask = (user == model.n_users) | (item == model.n_items)
+    unknown_index = np.flatnonzero(unknown_mask)
     unknown_num = len(unknown_index)
     if unknown_num > 0:
         unknown_str = (
-            f"Detect {unknown_num} unknown interaction(s), position: {unknown_index}"
+            f"Detect {unknown_num} unknown interaction(s), "
+            f"position: {unknown_index.tolist()}"
         )
         print(f"{colorize(unknown_str, 'red')}")
     return unknown_num, unknown_index, user, item
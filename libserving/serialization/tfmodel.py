@@ -54,11 +54,14 @@ def save_tf_serving_model(path: str, model: TfBase, version: int):
         outputs=outputs,
         method_name=tf.saved_model.signature_constants.PREDICT_METHOD_NAME,
     )
+    # int8 embeddings are not saved as variables, so rebuild them after restoring
+    main_op = model.quantize_op if getattr(model, "quantize_embeds", False) else None
     builder.add_meta_graph_and_variables(
         sess=model.sess,
         tags=[tf.saved_model.tag_constants.SERVING],
         signature_def_map={"predict": prediction_signature},
         clear_devices=True,
+        main_op=main_op,
         strip_default_attrs=True,
     )
 
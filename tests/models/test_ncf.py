@@ -1,9 +1,13 @@
 import sys
 
+import numpy as np
 import pytest
 import tensorflow as tf
+from scipy.special import expit
 
 from libreco.algorithms import NCF
+from libreco.recommendation.recommend import score_all_items_ncf
+from libreco.tfops import bf16_rewrite_option
 from tests.models.utils_tf import ptest_tf_variables
 from tests.utils_data import set_ranking_labels
 from tests.utils_metrics import get_metrics
@@ -18,19 +22,45 @@ from tests.utils_save_load import save_load_model
         ("rating", "focal", "random", None),
         ("rating", "focal", None, True),
         ("rating", "focal", "random", True),
-        ("ranking", "cross_entropy", "random", False),
         ("ranking", "focal", "random", False),
+        ("ranking", "unknown", "popular", True),
+    ],
+)
+def test_ncf_invalid_params(pure_data_small, task, loss_type, sampler, neg_sampling):
+    tf.compat.v1.reset_default_graph()
+    _, train_data, _, data_info = pure_data_small
+    if neg_sampling is None:
+        with pytest.raises(AssertionError):
+            NCF(task, data_info).fit(train_data, neg_sampling)
+    elif task == "rating" and neg_sampling:
+        with pytest.raises(ValueError):
+            NCF(task, data_info).fit(train_data, neg_sampling)
+    elif loss_type == "focal" and (neg_sampling is False or sampler is None):
+        with pytest.raises(ValueError):
+            NCF(task, data_info, sampler=sampler).fit(train_data, neg_sampling)
+    else:
+        with pytest.raises(ValueError):
+            NCF(task, data_info, loss_type).fit(train_data, neg_sampling)
+
+
+@pytest.mark.parametrize(
+    "task, loss_type, sampler, neg_sampling",
+    [
+        ("ranking", "cross_entropy", "random", False),
         ("ranking", "cross_entropy", "random", True),
         ("ranking", "cross_entropy", "unconsumed", True),
         ("ranking", "focal", "popular", True),
-        ("ranking", "unknown", "popular", True),
     ],
 )
 @pytest.mark.parametrize(
-    "lr_decay, reg, num_neg, use_bn, dropout_rate, hidden_units, num_workers",
+    "lr_decay, reg, num_neg, use_bn, dropout_rate, hidden_units, jit_compile, "
+    "quantize_embeds, mixed_precision, num_workers",
     [
-        (False, None, 1, False, None, (128, 64, 32), 0),
-        (True, 0.001, 3, True, 0.5, 1, 2),
+        (False, None, 1, False, None, (128, 64, 32), False, False, False, 0),
+        (True, 0.001, 3, True, 0.5, 1, False, False, False, 2),
+        (False, None, 1, False, None, (128, 64, 32), True, False, False, 0),
+        (False, None, 1, False, None, (128, 64, 32), False, True, False, 0),
+        (False, None, 1, False, None, (128, 64, 32), False, False, True, 0),
     ],
 )
 def test_ncf(
@@ -45,63 +75,129 @@ def test_ncf(
     use_bn,
     dropout_rate,
     hidden_units,
+    jit_compile,
+    quantize_embeds,
+    mixed_precision,
     num_workers,
 ):
     if not sys.platform.startswith("linux") and num_workers > 0:
         pytest.skip(
             "Windows and macOS use `spawn` in multiprocessing, which does not work well in pytest"
         )
+    if mixed_precision and bf16_rewrite_option() is None:
+        pytest.skip(
+            f"bfloat16 mixed precision is unavailable in TensorFlow {tf.__version__}"
+        )
     tf.compat.v1.reset_default_graph()
     pd_data, train_data, eval_data, data_info = pure_data_small
     if task == "ranking" and neg_sampling is False and loss_type == "cross_entropy":
         set_ranking_labels(train_data)
         set_ranking_labels(eval_data)
 
-    if neg_sampling is None:
-        with pytest.raises(AssertionError):
-            NCF(task, data_info).fit(train_data, neg_sampling)
-    elif task == "rating" and neg_sampling:
-        with pytest.raises(ValueError):
-            NCF(task, data_info).fit(train_data, neg_sampling)
-    elif loss_type == "focal" and (neg_sampling is False or sampler is None):
-        with pytest.raises(ValueError):
-            NCF(task, data_info, sampler=sampler).fit(train_data, neg_sampling)
-    elif task == "ranking" and loss_type not in ("cross_entropy", "focal"):
-        with pytest.raises(ValueError):
-            NCF(task, data_info, loss_type).fit(train_data, neg_sampling)
-    else:
-        model = NCF(
-            task=task,
-            data_info=data_info,
-            loss_type=loss_type,
-            embed_size=16,
-            n_epochs=1,
-            lr=1e-4,
-            lr_decay=lr_decay,
-            reg=reg,
-            batch_size=40,
-            sampler=sampler,
-            num_neg=num_neg,
-            use_bn=use_bn,
-            dropout_rate=dropout_rate,
-            hidden_units=hidden_units,
-            tf_sess_config=None,
-        )
-        model.fit(
-            train_data,
-            neg_sampling,
-            verbose=2,
-            shuffle=True,
-            eval_data=eval_data,
-            metrics=get_metrics(task),
-            eval_user_num=200,
-            num_workers=num_workers,
+    model = NCF(
+        task=task,
+        data_info=data_info,
+        loss_type=loss_type,
+        embed_size=16,
+        n_epochs=1,
+        lr=1e-4,
+        lr_decay=lr_decay,
+        reg=reg,
+        batch_size=40,
+        sampler=sampler,
+        num_neg=num_neg,
+        use_bn=use_bn,
+        dropout_rate=dropout_rate,
+        hidden_units=hidden_units,
+        jit_compile=jit_compile,
+        quantize_embeds=quantize_embeds,
+        tf_sess_config=None,
+        mixed_precision=mixed_precision,
+    )
+    model.fit(
+        train_data,
+        neg_sampling,
+        verbose=2,
+        shuffle=True,
+        eval_data=eval_data,
+        metrics=get_metrics(task),
+        eval_user_num=200,
+        num_workers=num_workers,
+    )
+    ptest_tf_variables(model)
+    ptest_preds(model, task, pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
+
+    # test save and load model
+    loaded_model, loaded_data_info = save_load_model(NCF, model, data_info)
+    ptest_preds(loaded_model, task, pd_data, with_feats=False)
+    ptest_recommends(loaded_model, loaded_data_info, pd_data, with_feats=False)
+
+
+def test_ncf_int8_inference(pure_data_small):
+    tf.compat.v1.reset_default_graph()
+    _, train_data, _, data_info = pure_data_small
+    model = NCF(
+        "ranking",
+        data_info,
+        n_epochs=2,
+        lr=1e-2,
+        batch_size=40,
+        use_bn=False,
+        quantize_embeds=True,
+    )
+    model.fit(train_data, neg_sampling=True, verbose=2)
+    ptest_int8_preds(model)
+
+    # int8 embeddings are rebuilt from the loaded float embeddings
+    loaded_model, _ = save_load_model(NCF, model, data_info)
+    ptest_int8_preds(loaded_model)
+
+
+def ptest_int8_preds(model):
+    size = min(model.n_users, model.n_items, 50)
+    users, items = np.arange(size), np.arange(size)[::-1]
+    # without batch normalization and dropout, `is_training` only switches
+    # between the float and int8 embeddings
+    float_preds, int8_preds = (
+        model.sess.run(
+            model.output,
+            {
+                model.user_indices: users,
+                model.item_indices: items,
+                model.is_training: is_training,
+            },
         )
-        ptest_tf_variables(model)
-        ptest_preds(model, task, pd_data, with_feats=False)
-        ptest_recommends(model, data_info, pd_data, with_feats=False)
-
-        # test save and load model
-        loaded_model, loaded_data_info = save_load_model(NCF, model, data_info)
-        ptest_preds(loaded_model, task, pd_data, with_feats=False)
-        ptest_recommends(loaded_model, loaded_data_info, pd_data, with_feats=False)
+        for is_training in (True, False)
+    )
+    assert np.std(float_preds) > 1e-3
+    np.testing.assert_allclose(int8_preds, float_preds, rtol=1e-2, atol=1e-2)
+    preds = model.predict(users, items, inner_id=True)
+    np.testing.assert_allclose(preds, expit(int8_preds), rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("quantize_embeds", [False, True])
+def test_ncf_score_all_items(pure_data_small, quantize_embeds):
+    tf.compat.v1.reset_default_graph()
+    _, train_data, _, data_info = pure_data_small
+    model = NCF(
+        "ranking",
+        data_info,
+        n_epochs=1,
+        batch_size=40,
+        use_bn=True,
+        dropout_rate=0.5,
+        quantize_embeds=quantize_embeds,
+    )
+    model.fit(train_data, neg_sampling=True, verbose=2)
+
+    users, n_items = np.array([3, 1, 2]), model.n_items
+    scores = score_all_items_ncf(model, users).reshape(len(users), n_items)
+    preds = model.predict(
+        np.repeat(users, n_items),
+        np.tile(np.arange(n_items), len(users)),
+        inner_id=True,
+    )
+    np.testing.assert_allclose(
+        expit(scores), preds.reshape(len(users), n_items), rtol=1e-5, atol=1e-6
+    )
@@ -13,18 +13,49 @@ from tests.utils_reco import ptest_recommends
 from tests.utils_save_load import save_load_model
 
 
+@pytest.mark.parametrize("task", ["rating", "ranking"])
+def test_wide_deep_invalid_lr(feat_data_small, task):
+    _, _, _, data_info = feat_data_small
+    with pytest.raises(AssertionError):
+        _ = WideDeep(task, data_info, lr=0.01)
+
+
 @pytest.mark.parametrize(
     "task, loss_type, sampler, neg_sampling",
     [
         ("rating", "focal", "random", None),
         ("rating", "focal", None, True),
         ("rating", "focal", "random", True),
-        ("ranking", "cross_entropy", "random", False),
         ("ranking", "focal", "unconsumed", False),
+        ("ranking", "unknown", "popular", True),
+    ],
+)
+def test_wide_deep_invalid_params(
+    feat_data_small, task, loss_type, sampler, neg_sampling
+):
+    tf.compat.v1.reset_default_graph()
+    _, train_data, _, data_info = feat_data_small
+    if neg_sampling is None:
+        with pytest.raises(AssertionError):
+            WideDeep(task, data_info).fit(train_data, neg_sampling)
+    elif task == "rating" and neg_sampling:
+        with pytest.raises(ValueError):
+            WideDeep(task, data_info).fit(train_data, neg_sampling)
+    elif loss_type == "focal" and (neg_sampling is False or sampler is None):
+        with pytest.raises(ValueError):
+            WideDeep(task, data_info, sampler=sampler).fit(train_data, neg_sampling)
+    else:
+        with pytest.raises(ValueError):
+            WideDeep(task, data_info, loss_type).fit(train_data, neg_sampling)
+
+
+@pytest.mark.parametrize(
+    "task, loss_type, sampler, neg_sampling",
+    [
+        ("ranking", "cross_entropy", "random", False),
         ("ranking", "cross_entropy", "random", True),
         ("ranking", "cross_entropy", "unconsumed", True),
         ("ranking", "focal", "popular", True),
-        ("ranking", "unknown", "popular", True),
     ],
 )
 @pytest.mark.parametrize(
@@ -32,7 +63,6 @@ from tests.utils_save_load import save_load_model
     [
         ({"wide": 0.01, "deep": 3e-4}, False, None, 1, False, None, 1, 0),
         (None, True, 0.001, 3, True, 0.5, (32, 16), 2),
-        (0.01, True, 0.001, 3, True, 0.5, 1, 0),
     ],
 )
 def test_wide_deep(
@@ -60,54 +90,38 @@ def test_wide_deep(
         set_ranking_labels(train_data)
         set_ranking_labels(eval_data)
 
-    if lr == 0.01:
-        with pytest.raises(AssertionError):
-            _ = WideDeep(task, data_info, loss_type, lr=lr)
-    elif neg_sampling is None:
-        with pytest.raises(AssertionError):
-            WideDeep(task, data_info).fit(train_data, neg_sampling)
-    elif task == "rating" and neg_sampling:
-        with pytest.raises(ValueError):
-            WideDeep(task, data_info).fit(train_data, neg_sampling)
-    elif loss_type == "focal" and (neg_sampling is False or sampler is None):
-        with pytest.raises(ValueError):
-            WideDeep(task, data_info, sampler=sampler).fit(train_data, neg_sampling)
-    elif task == "ranking" and loss_type not in ("cross_entropy", "focal"):
-        with pytest.raises(ValueError):
-            WideDeep(task, data_info, loss_type).fit(train_data, neg_sampling)
-    else:
-        model = WideDeep(
-            task=task,
-            data_info=data_info,
-            loss_type=loss_type,
-            embed_size=4,
-            n_epochs=1,
-            lr=lr,
-            lr_decay=lr_decay,
-            reg=reg,
-            batch_size=80,
-            sampler=sampler,
-            num_neg=num_neg,
-            use_bn=use_bn,
-            dropout_rate=dropout_rate,
-            hidden_units=hidden_units,
-            tf_sess_config=None,
-        )
-        model.fit(
-            train_data,
-            neg_sampling,
-            verbose=2,
-            shuffle=True,
-            eval_data=eval_data,
-            metrics=get_metrics(task),
-            eval_user_num=200,
-            num_workers=num_workers,
-        )
-        ptest_tf_variables(model)
-        ptest_preds(model, task, pd_data, with_feats=True)
-        ptest_recommends(model, data_info, pd_data, with_feats=True)
-        with pytest.raises(ValueError):
-            model.recommend_user(1, 7, seq=[1, 2, 3])
+    model = WideDeep(
+        task=task,
+        data_info=data_info,
+        loss_type=loss_type,
+        embed_size=4,
+        n_epochs=1,
+        lr=lr,
+        lr_decay=lr_decay,
+        reg=reg,
+        batch_size=80,
+        sampler=sampler,
+        num_neg=num_neg,
+        use_bn=use_bn,
+        dropout_rate=dropout_rate,
+        hidden_units=hidden_units,
+        tf_sess_config=None,
+    )
+    model.fit(
+        train_data,
+        neg_sampling,
+        verbose=2,
+        shuffle=True,
+        eval_data=eval_data,
+        metrics=get_metrics(task),
+        eval_user_num=200,
+        num_workers=num_workers,
+    )
+    ptest_tf_variables(model)
+    ptest_preds(model, task, pd_data, with_feats=True)
+    ptest_recommends(model, data_info, pd_data, with_feats=True)
+    with pytest.raises(ValueError):
+        model.recommend_user(1, 7, seq=[1, 2, 3])
 
 
 def test_wide_deep_multi_sparse(prepare_multi_sparse_data):
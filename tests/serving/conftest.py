@@ -84,9 +84,15 @@ def embed_model(prepare_pure_data):
 def tf_model(prepare_pure_data, request):
     tf.compat.v1.reset_default_graph()
     remove_path(SAVE_PATH)
-    if request.param == "pure":
+    if request.param.startswith("pure"):
         _, train_data, _, data_info = prepare_pure_data
-        model = NCF("ranking", data_info, n_epochs=1, batch_size=2048)
+        model = NCF(
+            "ranking",
+            data_info,
+            n_epochs=1,
+            batch_size=2048,
+            quantize_embeds=request.param == "pure-int8",
+        )
         model.fit(train_data, neg_sampling=True, verbose=2)
         return model
     else:
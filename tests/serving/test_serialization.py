@@ -82,6 +82,31 @@ def test_tf_serialization(tf_model, redis_client):
     assert isinstance(loaded_model, MetaGraphDef)
 
 
+@pytest.mark.parametrize("tf_model", ["pure-int8"], indirect=True)
+def test_tf_serialization_int8(tf_model):
+    save_tf(SAVE_PATH, tf_model, version=1)
+    user_indices, item_indices = [1, 2, 3], [3, 2, 1]
+    preds = tf_model.sess.run(
+        tf_model.output,
+        {tf_model.user_indices: user_indices, tf_model.item_indices: item_indices},
+    )
+
+    SAVE_MODEL_PATH = os.path.join(SAVE_PATH, "ncf", "1")
+    with tf.Session(graph=tf.Graph()) as sess:
+        loaded_model = tf.saved_model.load(
+            sess, [tf.saved_model.tag_constants.SERVING], SAVE_MODEL_PATH
+        )
+        signature = loaded_model.signature_def["predict"]
+        feed_dict = {
+            signature.inputs["user_indices"].name: user_indices,
+            signature.inputs["item_indices"].name: item_indices,
+        }
+        # int8 embeddings must be rebuilt when loading, otherwise they are
+        # uninitialized or all zeros
+        serving_preds = sess.run(signature.outputs["logits"].name, feed_dict)
+    np.testing.assert_allclose(serving_preds, preds, rtol=1e-5, atol=1e-5)
+
+
 @pytest.mark.parametrize(
     "online_model",
     ["pure", "user_feat", "separate", "multi_sparse", "item_feat", "all"],
@@ -25,7 +25,7 @@ from libreco.batch.collators import (
 from libreco.batch.enums import Backend
 from libreco.data import DatasetFeat
 from libreco.graph.message import ItemMessageDGL, UserMessage
-from libreco.sampling.negatives import negatives_from_unconsumed
+from libreco.sampling.negatives import consumed_pair_keys, negatives_from_unconsumed
 from libreco.tfops import tf
 
 raw_data = """
@@ -396,16 +396,36 @@ def test_graph_dgl_collator(config_feat_data):
     assert isinstance(item_data, ItemMessageDGL)
 
 
+def test_negatives_from_unconsumed():
+    n_items = 20
+    num_neg = 4
+    consumed_users = [0, 0, 0, 1, 1, 2, 2, 2, 2, 2]
+    consumed_items = [0, 1, 2, 5, 6, 10, 11, 12, 13, 14]
+    consumed_keys = consumed_pair_keys(consumed_users, consumed_items, n_items)
+    users = [0, 1, 2, 0]
+    items = [1, 5, 12, 2]
+    np_rng = np.random.default_rng(42)
+    negatives = negatives_from_unconsumed(
+        np_rng, consumed_keys, users, items, n_items, num_neg
+    )
+    assert negatives.shape == (len(users) * num_neg,)
+    user_consumed = {0: {0, 1, 2}, 1: {5, 6}, 2: {10, 11, 12, 13, 14}}
+    for u, negs in zip(users, negatives.reshape(-1, num_neg)):
+        assert len(set(negs.tolist())) == num_neg
+        assert not user_consumed[u] & set(negs.tolist())
+
+
 def test_negatives_exceed_sampling_tolerance():
     users = [0, 1, 2]
     items = [1, 2, 4]
-    user_consumed_set = {0: {1}, 1: {3, 4}, 2: {1, 2, 3}}
     n_items = 5
+    consumed_keys = consumed_pair_keys([0, 1, 1, 2, 2, 2], [1, 3, 4, 1, 2, 3], n_items)
     num_neg = 5
     tolerance = 100
+    np_rng = np.random.default_rng(42)
     negatives = np.array_split(
         negatives_from_unconsumed(
-            user_consumed_set, users, items, n_items, num_neg, tolerance
+            np_rng, consumed_keys, users, items, n_items, num_neg, tolerance
         ),
         3,
     )
@@ -3,10 +3,14 @@ import sys
 import numpy as np
 import pytest
 from numpy.testing import assert_allclose, assert_array_equal
+from tensorflow.core.protobuf.rewriter_config_pb2 import RewriterConfig
 
 from libreco.layers import (
     conv_nn,
     dense_nn,
+    int8_embedding_lookup,
+    int8_embedding_vars,
+    int8_quantize,
     layer_normalization,
     max_pool,
     multi_head_attention,
@@ -21,7 +25,14 @@ from libreco.layers.transformer import (
     transformer_decoder_layer,
     transformer_encoder_layer,
 )
-from libreco.tfops import dropout_config, reg_config, tf
+from libreco.tfops import (
+    bf16_rewrite_option,
+    build_sess_config,
+    dropout_config,
+    reg_config,
+    sess_config,
+    tf,
+)
 
 
 @pytest.fixture
@@ -228,6 +239,27 @@ def test_transformer_decoder():
         assert sess.run(output).shape == (batch_size, max_seq_len, embed_size)
 
 
+def test_int8_embedding():
+    tf.reset_default_graph()
+    embeds = np.random.default_rng(42).normal(size=(10, 8)).astype(np.float32)
+    embeds[3] = 0.0  # all-zero row should not produce nan
+    embed_var = tf.Variable(embeds)
+    codes_var, scales_var = int8_embedding_vars("embed_var", (10, 8))
+    quantize_op = int8_quantize(embed_var, codes_var, scales_var)
+    output = int8_embedding_lookup([1, 3, 5], codes_var, scales_var)
+    assert codes_var not in tf.global_variables()
+    assert scales_var not in tf.global_variables()
+    with tf.Session() as sess:
+        sess.run(tf.global_variables_initializer())
+        sess.run(tf.local_variables_initializer())
+        sess.run(quantize_op)
+        assert codes_var.dtype.base_dtype == tf.int8
+        dequantized = sess.run(output)
+        max_error = np.abs(embeds[[1, 3, 5]]).max(axis=1, keepdims=True) / 254
+        assert np.all(np.abs(dequantized - embeds[[1, 3, 5]]) <= max_error + 1e-6)
+        assert_array_equal(dequantized[1], np.zeros(8))
+
+
 def test_gelu():
     with tf.Session() as sess:
         inputs = tf.constant([-3.0, -1.0, 0.0, 1.0, 3.0], dtype=tf.float32)
@@ -254,3 +286,18 @@ def test_config():
 
     with pytest.raises(ValueError):
         dropout_config(1.1)
+
+    sess = sess_config()
+    assert isinstance(sess, tf.Session)
+    sess.close()
+
+    bf16_option = bf16_rewrite_option()
+    if bf16_option is None:
+        with pytest.raises(ValueError):
+            build_sess_config(mixed_precision=True)
+    else:
+        rewrite_options = build_sess_config().graph_options.rewrite_options
+        assert getattr(rewrite_options, bf16_option) != RewriterConfig.ON
+        config = build_sess_config(mixed_precision=True)
+        rewrite_options = config.graph_options.rewrite_options
+        assert getattr(rewrite_options, bf16_option) == RewriterConfig.ON